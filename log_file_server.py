@@ -1,39 +1,160 @@
+import asyncio
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from pathlib import Path
 
+import orjson
 import uvicorn
 from fastapi import FastAPI
-from fastapi.responses import FileResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles
+from watchfiles import Change, awatch
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Watch the logs directory for the lifetime of the app"""
+    stop_event = asyncio.Event()
+    watcher = asyncio.create_task(_watch_logs(stop_event))
+    yield
+    stop_event.set()
+    await watcher
+
 
 app = FastAPI(
     title="Log File Server",
     description="Server to serve static files from logs directory",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
-# Get the logs directory path
-logs_dir = Path(__file__).parent / "logs"
+# Get the logs directory path, resolved once at import along with the plain
+# string form used by the listing's os calls
+logs_dir = (Path(__file__).parent / "logs").resolve()
+_LOGS_DIR_STR = str(logs_dir)
 
-# Mount the logs directory as static files
-app.mount("/logs", StaticFiles(directory=str(logs_dir)), name="logs")
+# Serve the log files themselves with StaticFiles, which already answers
+# conditional (ETag/If-Modified-Since), Range and HEAD requests. In the
+# container NGINX serves /logs/* before requests ever get here
+log_files = StaticFiles(directory=_LOGS_DIR_STR, check_dir=False)
+app.mount("/logs", log_files, name="logs")
 
+# Cache the directory listing so repeated polling of the root endpoint doesn't
+# hit the filesystem on every request. While the directory watcher is running
+# the listing is kept current from filesystem events and only expires after a
+# long TTL, in case an event was missed or filtered out (watchfiles ignores
+# names like *.swp and *~); otherwise it expires after a short TTL
+_LISTING_TTL = 2.0
+_WATCHED_LISTING_TTL = 60.0
+_listing_cache = {"ts": 0.0, "body": b"", "watched": False}
 
-@app.get("/")
-async def root():
-    """Root endpoint that provides information about available log files"""
-    try:
-        log_files = [
-            f for f in os.listdir(logs_dir) if os.path.isfile(os.path.join(logs_dir, f))
-        ]
-        return {
+# Symlinked entries past this count are stat'ed in parallel when listing
+_PARALLEL_STAT_THRESHOLD = 64
+_PARALLEL_STAT_WORKERS = 16
+
+# The constant part of the root endpoint's JSON is encoded once; only the file
+# list is serialized when the listing is refreshed
+_ROOT_BODY_PREFIX = (
+    orjson.dumps(
+        {
             "message": "Log File Server",
             "description": "Access log files at /logs/{filename}",
-            "available_files": log_files,
             "example": "/logs/scraper.log",
         }
-    except Exception as e:
-        return {"message": "Log File Server", "error": str(e)}
+    )[:-1]
+    + b',"available_files":'
+)
+
+
+def _get_cached_listing():
+    """Return the cached JSON body for the root endpoint, or None if it has expired"""
+    ts = _listing_cache["ts"]
+    ttl = _WATCHED_LISTING_TTL if _listing_cache["watched"] else _LISTING_TTL
+    if ts and time.monotonic() - ts < ttl:
+        return _listing_cache["body"]
+    return None
+
+
+def _refresh_listing():
+    """Scan the logs directory and rebuild the cached root response body (blocking)"""
+    now = time.monotonic()
+    # scandir exposes the file type from the directory read itself, so there's
+    # no extra stat per entry like with listdir + isfile
+    with os.scandir(_LOGS_DIR_STR) as it:
+        entries = list(it)
+
+    # Symlinks still need a stat each to see what they point to. On slow or
+    # remote storage that adds up, so with many of them the stats are spread
+    # over threads first (DirEntry caches the result for is_file below)
+    links = [entry for entry in entries if entry.is_symlink()]
+    if len(links) > _PARALLEL_STAT_THRESHOLD:
+        with ThreadPoolExecutor(max_workers=_PARALLEL_STAT_WORKERS) as executor:
+            list(executor.map(os.DirEntry.is_file, links))
+
+    log_files = [entry.name for entry in entries if entry.is_file()]
+    body = _ROOT_BODY_PREFIX + orjson.dumps(log_files) + b"}"
+    _listing_cache["ts"] = now
+    _listing_cache["body"] = body
+    return body
+
+
+async def _watch_logs(stop_event):
+    """Rebuild the cached listing when files are added to or removed from the logs"""
+    try:
+        async for changes in awatch(
+            _LOGS_DIR_STR, stop_event=stop_event, recursive=False, yield_on_timeout=True
+        ):
+            # The first (timeout) yield means the watch is set up; content
+            # changes to existing files don't affect the listing
+            if not _listing_cache["watched"] or any(
+                change != Change.modified for change, _ in changes
+            ):
+                await run_in_threadpool(_refresh_listing)
+                _listing_cache["watched"] = True
+    except OSError as e:
+        # e.g. the directory doesn't exist yet; the TTL cache covers this
+        print(f"Not watching {_LOGS_DIR_STR} for changes: {e}")
+    finally:
+        _listing_cache["watched"] = False
+
+
+@app.get("/")
+async def root():
+    """Root endpoint that provides information about available log files"""
+    body = _get_cached_listing()
+    if body is None:
+        # Only cache misses touch the filesystem, and that's kept off the
+        # event loop so a slow directory read doesn't stall other requests
+        try:
+            body = await run_in_threadpool(_refresh_listing)
+        except OSError as e:
+            return ORJSONResponse({"message": "Log File Server", "error": str(e)})
+    return Response(body, media_type="application/json")
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8080)
+    # Spread requests over one worker per core; uvicorn needs the import string
+    # rather than the app object to spawn workers
+    workers = int(os.getenv("LOG_SERVER_WORKERS", os.cpu_count() or 1))
+
+    # Behind the NGINX front in the container this binds to localhost only
+    host = os.getenv("LOG_SERVER_HOST", "0.0.0.0")
+    port = int(os.getenv("LOG_SERVER_PORT", 8080))
+
+    # uvloop and httptools are the C-accelerated event loop and HTTP parser.
+    # The access log is off since it costs a write per request and the files
+    # being served are logs already
+    uvicorn.run(
+        "log_file_server:app",
+        host=host,
+        port=port,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        access_log=False,
+        # Deeper accept queue to absorb bursts of polling clients
+        backlog=4096,
+    )
@@ -22,40 +22,329 @@ Usage examples:
     uploader.attach_uploaded_files_to_vector_store()
 """
 
+import asyncio
+import hashlib
 import json
+import logging
 import os
+import random
 import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 from http import client
 from pathlib import Path
 
 import html2text
 import httpx
 import openai
-import requests
-from bs4 import BeautifulSoup
+import orjson
 from dotenv import load_dotenv
-from openai import OpenAI
+from html2text.utils import escape_md_section
+from lxml import etree
+from lxml import html as lxml_html
+from openai import AsyncOpenAI, DefaultAioHttpClient, DefaultHttpxClient, OpenAI
+
+# Per-item progress goes here; main() only shows it with --verbose
+logger = logging.getLogger(__name__)
+
+# Regexes used for every article, compiled once
+_SLUG_STRIP = re.compile(r"[^a-z0-9\s\-]")
+_SLUG_DASH = re.compile(r"[\s\-]+")
+_MD_BLANK = re.compile(r"\n\s*\n\s*\n")
+_MARKUP_CHARS = re.compile(r"[<>&]")
+
+# Below this many changed articles, rendering inline is cheaper than starting
+# the process pool
+_INLINE_RENDER_LIMIT = 32
+
+# Most recently used API responses kept in memory; older ones are reloaded
+# from the on-disk cache when needed
+_RESPONSE_CACHE_MAX_ENTRIES = 1024
+# On-disk cache entries not refreshed for this long belong to URLs the scraper
+# no longer requests and are deleted
+_RESPONSE_CACHE_MAX_AGE = 7 * 24 * 3600
+
+# Markdown file layout for a saved article; missing fields render as N/A.
+# Only fields that are part of the content hash (or never change) go in the
+# file, so a content-neutral edit leaves it, and its uploaded copy, current;
+# updated_at/edited_at live in the metadata
+ARTICLE_TEMPLATE = (
+    "# {title}\n"
+    "\n"
+    "**Article ID:** {id}  \n"
+    "**Section ID:** {section_id}  \n"
+    "**Article URL:** {html_url}  \n"
+    "**Created At:** {created_at}  \n"
+    "\n"
+    "---\n"
+    "\n"
+    "{body}\n"
+)
+
+
+class _Default(dict):
+    """Dict for str.format_map that fills missing keys with N/A"""
+
+    def __missing__(self, key):
+        return "N/A"
+
+
+# Upload statuses that always mean an article has to be (re)uploaded
+_UPLOAD_STATUS_REASONS = {
+    "pending": "never_uploaded",
+    "failed": "previous_upload_failed",
+}
+
+# Elements stripped from article HTML before conversion: navigation, scripts,
+# styles, asides, footers and anything with a common ad/navigation class
+_STRIP_XPATH = etree.XPath(
+    "//nav|//script|//style|//aside|//footer"
+    "|//*[re:test(@class, '(nav|ad|advertisement|sidebar|footer|header)', 'i')]",
+    namespaces={"re": "http://exslt.org/regular-expressions"},
+)
+
+
+def get_upload_reason(article_data, force_reupload=False):
+    """Get why an article needs uploading to OpenAI, or None if it is up to date"""
+    if force_reupload:
+        return "force_reupload"
+
+    upload_status = article_data.get("openai_upload_status", "pending")
+    if upload_status in _UPLOAD_STATUS_REASONS:
+        return _UPLOAD_STATUS_REASONS[upload_status]
+
+    if upload_status == "uploaded":
+        current_updated_at = article_data.get("updated_at")
+        last_uploaded_version = article_data.get("last_uploaded_updated_at")
+        if current_updated_at and not last_uploaded_version:
+            # Old metadata format, assume needs update
+            return "metadata_migration"
+        if current_updated_at and current_updated_at != last_uploaded_version:
+            # Content has been updated since last upload
+            return "content_updated"
+    return None
+
+
+def write_bytes_atomic(path, data):
+    """Write a file via a synced temp file and os.replace so it is never half-written"""
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        # Don't leave the partial temp file behind
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def positive_int_env(name, default):
+    """Read a positive integer from an environment variable, or return default"""
+    value = os.getenv(name, "").strip()
+    if not value:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        print(f"Ignoring {name}={value!r}: not a positive integer, using {default}")
+        return default
+    return number
+
+
+def default_render_workers(cap=2):
+    """Get how many render processes to start: the usable CPUs, capped"""
+    # os.cpu_count() reports every core on the host, even when the container
+    # only gets a fraction of one, and each worker is a full interpreter
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    return max(1, min(cpus, cap))
+
+
+def markdown_file_index(directory):
+    """Map each .md filename in a directory to its path with a single scandir"""
+    try:
+        with os.scandir(directory) as entries:
+            return {
+                entry.name: entry.path
+                for entry in entries
+                if entry.name.endswith(".md") and entry.is_file()
+            }
+    except FileNotFoundError:
+        return {}
 
 
 class Scraper:
     """A web scraper for OptSigns support articles"""
 
-    def __init__(self, output_dir="articles"):
+    def __init__(
+        self,
+        output_dir="articles",
+        cache_ttl=3600,
+        max_connections=64,
+        render_workers=None,
+    ):
         """Initialize the scraper with default output directory"""
         self.output_dir = output_dir
+        # Processes used to render changed articles to Markdown
+        self.render_workers = render_workers or default_render_workers()
         self.base_url = "https://support.optisigns.com/api/v2/help_center/en-us"
+        # Upper bound on concurrent requests to the help center API
+        self.max_connections = max_connections
+        # Category/section listings barely change between runs; keep them
+        # in memory and on disk for cache_ttl seconds.
+        self.cache_ttl = cache_ttl
+        self.cache_dir = os.path.join(output_dir, ".http_cache")
+        # Create the output and cache directories once instead of on every save
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._prune_cache_dir()
+        self._response_cache = OrderedDict()
+        self._inflight = {}
+
+    def __getstate__(self):
+        """Pickle without the response cache and in-flight requests, for workers"""
+        state = self.__dict__.copy()
+        state["_response_cache"] = OrderedDict()
+        state["_inflight"] = {}
+        return state
+
+    def _prune_cache_dir(self):
+        """Delete on-disk cache entries that haven't been refreshed recently"""
+        cutoff = time.time() - _RESPONSE_CACHE_MAX_AGE
+        try:
+            with os.scandir(self.cache_dir) as entries:
+                for entry in entries:
+                    try:
+                        if not entry.name.endswith(".json"):
+                            continue
+                        if entry.stat().st_mtime < cutoff:
+                            os.remove(entry.path)
+                    except OSError:
+                        pass
+        except OSError as e:
+            print(f"Error pruning response cache: {e}")
+
+    def _remember_response(self, url, entry):
+        """Store a response entry in the in-memory LRU, evicting the oldest"""
+        self._response_cache[url] = entry
+        self._response_cache.move_to_end(url)
+        if len(self._response_cache) > _RESPONSE_CACHE_MAX_ENTRIES:
+            self._response_cache.popitem(last=False)
+
+    def _cache_path(self, url):
+        """Get the on-disk cache file for a URL"""
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load_cached_response(self, url):
+        """Load a cached response entry from disk, or None"""
+        try:
+            with open(self._cache_path(url), "rb") as f:
+                entry = orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+        return entry if entry.get("url") == url else None
+
+    def _save_cached_response(self, url, entry):
+        """Persist a response entry to the on-disk cache"""
+        try:
+            with open(self._cache_path(url), "wb") as f:
+                f.write(orjson.dumps(entry))
+        except OSError as e:
+            print(f"Error writing response cache for {url}: {e}")
+
+    async def fetch_json(self, http_client, url):
+        """Fetch a JSON API response, served from cache while still fresh"""
+        entry = self._response_cache.get(url)
+        if entry is None:
+            entry = self._load_cached_response(url)
+        if entry is not None:
+            self._remember_response(url, entry)
+        if entry is not None and time.time() - entry["fetched_at"] < self.cache_ttl:
+            return entry["data"]
+
+        # Concurrent callers for the same URL share one request
+        pending = self._inflight.get(url)
+        if pending is not None:
+            return await pending
+
+        task = asyncio.ensure_future(self._fetch_and_cache(http_client, url, entry))
+        self._inflight[url] = task
+        try:
+            return await task
+        finally:
+            del self._inflight[url]
+
+    async def _fetch_and_cache(self, http_client, url, cached=None):
+        """Fetch a URL and store its JSON body in the response cache"""
+        # Revalidate a stale entry so unchanged pages come back as 304
+        headers = {}
+        if cached is not None:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        response = await http_client.get(url, headers=headers)
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        if response.status_code == 304 and cached is not None:
+            data = cached["data"]
+            etag = etag or cached.get("etag")
+            last_modified = last_modified or cached.get("last_modified")
+        else:
+            response.raise_for_status()  # Raise an exception for bad status codes
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError, so the
+            # callers' handlers still apply
+            data = orjson.loads(response.content)
+
+        entry = {
+            "url": url,
+            "fetched_at": time.time(),
+            "etag": etag,
+            "last_modified": last_modified,
+            "data": data,
+        }
+        self._remember_response(url, entry)
+        self._save_cached_response(url, entry)
+        return data
+
+    async def fetch_all_pages(self, http_client, url, key):
+        """Fetch every page of a paginated list endpoint and return all the items"""
+        data = await self.fetch_json(http_client, url)
+        items = list(data.get(key, []))
+
+        # The first page tells us how many there are, so fetch the rest together
+        page_count = data.get("page_count") or 1
+        if page_count > 1:
+            pages = await asyncio.gather(
+                *(
+                    self.fetch_json(http_client, f"{url}&page={page}")
+                    for page in range(2, page_count + 1)
+                )
+            )
+            for page in pages:
+                items.extend(page.get(key, []))
+
+        return items
 
-    def get_sections_from_category(self, category_id):
+    async def get_sections_from_category(self, http_client, category_id):
         """Get all sections from a specific category ID"""
         url = f"{self.base_url}/categories/{category_id}/sections?sort_by=position&sort_order=desc&per_page=100"
 
         try:
-            response = requests.get(url)
-            response.raise_for_status()  # Raise an exception for bad status codes
-
-            data = response.json()
-            sections = data.get("sections", [])
+            sections = await self.fetch_all_pages(http_client, url, "sections")
 
             section_ids = []
             for section in sections:
@@ -72,7 +361,7 @@ class Scraper:
 
             return section_ids
 
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"Error fetching sections for category {category_id}: {e}")
             return []
         except json.JSONDecodeError as e:
@@ -84,9 +373,9 @@ class Scraper:
         # Convert to lowercase and replace spaces with hyphens
         slug = title.lower()
         # Remove special characters and keep only alphanumeric, spaces, and hyphens
-        slug = re.sub(r"[^a-z0-9\s\-]", "", slug)
+        slug = _SLUG_STRIP.sub("", slug)
         # Replace multiple spaces or hyphens with single hyphen
-        slug = re.sub(r"[\s\-]+", "-", slug)
+        slug = _SLUG_DASH.sub("-", slug)
         # Remove leading/trailing hyphens
         slug = slug.strip("-")
         return slug
@@ -96,18 +385,23 @@ class Scraper:
         if not html_content:
             return ""
 
-        # Parse HTML with BeautifulSoup
-        soup = BeautifulSoup(html_content, "html.parser")
+        # Plain text with no tags or entities skips the parser and converter;
+        # escaping and then collapsing whitespace gives what html2text would
+        if not _MARKUP_CHARS.search(html_content):
+            return " ".join(escape_md_section(html_content).split())
 
-        # Remove unwanted elements (nav, ads, scripts, etc.)
-        for element in soup.find_all(["nav", "script", "style", "aside", "footer"]):
-            element.decompose()
+        # Parse HTML with lxml
+        try:
+            tree = lxml_html.document_fromstring(html_content)
+        except etree.ParserError:
+            # Whitespace-only or otherwise empty document
+            return ""
 
-        # Remove elements with common ad/navigation classes
-        for element in soup.find_all(
-            class_=re.compile(r"(nav|ad|advertisement|sidebar|footer|header)", re.I)
-        ):
-            element.decompose()
+        # Remove unwanted elements (nav, ads, scripts, etc.) and elements with
+        # common ad/navigation classes in one XPath pass. drop_tree keeps the
+        # text that follows the removed element
+        for element in _STRIP_XPATH(tree):
+            element.drop_tree()
 
         # Convert to markdown
         h = html2text.HTML2Text()
@@ -118,25 +412,28 @@ class Scraper:
         h.unicode_snob = True
         h.mark_code = True
 
-        markdown_content = h.handle(str(soup))
+        markdown_content = h.handle(lxml_html.tostring(tree, encoding="unicode"))
 
         # Clean up extra whitespace
-        markdown_content = re.sub(r"\n\s*\n\s*\n", "\n\n", markdown_content)
+        markdown_content = _MD_BLANK.sub("\n\n", markdown_content)
         markdown_content = markdown_content.strip()
 
         return markdown_content
 
-    def load_articles_metadata(self, output_dir=None):
-        """Load articles metadata from the central JSON file"""
-        if output_dir is None:
-            output_dir = self.output_dir
+    def _metadata_path(self, directory=None):
+        """Get the path of the central metadata JSON file in a directory"""
+        if directory is None:
+            directory = self.output_dir
+        return Path(directory) / "articles_metadata.json"
 
-        metadata_file = os.path.join(output_dir, "articles_metadata.json")
+    def load_articles_metadata(self, output_dir=None, articles_directory=None):
+        """Load articles metadata from the central JSON file"""
+        metadata_file = self._metadata_path(output_dir or articles_directory)
 
-        if os.path.exists(metadata_file):
+        if metadata_file.exists():
             try:
-                with open(metadata_file, "r", encoding="utf-8") as f:
-                    metadata = json.load(f)
+                with open(metadata_file, "rb") as f:
+                    metadata = orjson.loads(f.read())
                     # Ensure compatibility with new attachment fields
                     return self.ensure_metadata_compatibility(metadata)
             except Exception as e:
@@ -156,74 +453,111 @@ class Scraper:
                 article_data["vector_store_id"] = None
         return metadata
 
-    def save_articles_metadata(self, metadata_dict, output_dir=None):
+    def save_articles_metadata(
+        self, metadata_dict, output_dir=None, articles_directory=None
+    ):
         """Save articles metadata to the central JSON file"""
+        metadata_file = self._metadata_path(output_dir or articles_directory)
+        metadata_file.parent.mkdir(parents=True, exist_ok=True)
+
+        try:
+            write_bytes_atomic(
+                metadata_file, orjson.dumps(metadata_dict, option=orjson.OPT_INDENT_2)
+            )
+        except Exception as e:
+            print(f"Error saving metadata file: {e}")
+
+    def article_content_hash(self, article):
+        """Compute a SHA-256 of the article fields that end up in the Markdown body"""
+        content = (
+            article["title"],
+            article["section_id"],
+            article.get("html_url"),
+            article.get("body", ""),
+        )
+        return hashlib.sha256(orjson.dumps(content)).hexdigest()
+
+    def article_needs_update(self, article, all_metadata, output_dir=None):
+        """Check if an article changed since it was last saved"""
+        # An unchanged edited_at means nothing changed; otherwise the content
+        # hash decides
         if output_dir is None:
             output_dir = self.output_dir
 
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+        existing_article = all_metadata.get(str(article["id"]))
+        if not existing_article:
+            return True
+        edited_at = article.get("edited_at")
+        if edited_at is not None and existing_article.get("edited_at") == edited_at:
+            return False
 
-        metadata_file = os.path.join(output_dir, "articles_metadata.json")
+        # edited_at also moves on edits that leave the content as it was, and
+        # without it the hash is the only way to tell
+        markdown_file = existing_article.get("markdown_file", f"{article['id']}.md")
+        return existing_article.get(
+            "content_sha256"
+        ) != self.article_content_hash(article) or not os.path.exists(
+            os.path.join(output_dir, markdown_file)
+        )
 
-        try:
-            with open(metadata_file, "w", encoding="utf-8") as f:
-                json.dump(metadata_dict, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"Error saving metadata file: {e}")
+    def render_article_markdown(self, article):
+        """Render the full Markdown file content for an article, header included"""
+        # Convert HTML body to Markdown
+        markdown_content = self.html_to_markdown(article.get("body", ""))
+
+        # Create full markdown content with metadata
+        return ARTICLE_TEMPLATE.format_map(_Default(article, body=markdown_content))
 
-    def save_article_as_markdown(self, article, output_dir=None):
+    def save_article_as_markdown(
+        self, article, all_metadata=None, output_dir=None, full_content=None
+    ):
         """Save article as Markdown file using article ID as filename and update central metadata"""
         if output_dir is None:
             output_dir = self.output_dir
+        elif output_dir != self.output_dir:
+            # Only the default output directory is created up front
+            os.makedirs(output_dir, exist_ok=True)
 
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
-
-        # Load existing metadata
-        all_metadata = self.load_articles_metadata(output_dir)
+        # Load existing metadata, unless the caller passed in the metadata dict
+        # (it's then updated in place and saved by the caller)
+        save_metadata = all_metadata is None
+        if save_metadata:
+            all_metadata = self.load_articles_metadata(output_dir)
 
         # Use article ID as filename instead of title slug
         article_id = str(article["id"])
         filename = f"{article_id}.md"
         filepath = os.path.join(output_dir, filename)
 
-        # Check if article needs updating by comparing edited_at dates
-        should_update = True
-        existing_article = all_metadata.get(article_id, {})
-        existing_edited_at = existing_article.get("edited_at")
-        current_edited_at = article.get("edited_at")
-
-        if existing_edited_at == current_edited_at:
-            should_update = False
-        else:
-            should_update = True
-
-        if not should_update:
+        if not self.article_needs_update(article, all_metadata, output_dir):
+            # Record a content-neutral edit without touching the file or its
+            # upload status
+            existing_article = all_metadata[article_id]
+            if existing_article.get("edited_at") != article.get("edited_at"):
+                # The uploaded copy is still current, so move its version along
+                # too or get_upload_reason would re-upload it as content_updated
+                if existing_article.get("openai_upload_status") == "uploaded" and (
+                    existing_article.get("last_uploaded_updated_at")
+                    == existing_article.get("updated_at")
+                ):
+                    existing_article["last_uploaded_updated_at"] = article.get(
+                        "updated_at"
+                    )
+                existing_article["updated_at"] = article.get("updated_at")
+                existing_article["edited_at"] = article.get("edited_at")
+                existing_article["last_scraped"] = self.get_current_timestamp()
+                if save_metadata:
+                    self.save_articles_metadata(all_metadata, output_dir)
             return filepath
 
-        # Convert HTML body to Markdown
-        markdown_content = self.html_to_markdown(article.get("body", ""))
-
-        # Create full markdown content with metadata
-        full_content = f"""# {article['title']}
-
-**Article ID:** {article['id']}  
-**Section ID:** {article['section_id']}  
-**Article URL:** {article.get('html_url', 'N/A')}  
-**Created At:** {article.get('created_at', 'N/A')}  
-**Updated At:** {article.get('updated_at', 'N/A')}  
-**Edited At:** {article.get('edited_at', 'N/A')}  
-
----
-
-{markdown_content}
-"""
+        # Content may already have been rendered by the caller (in a worker process)
+        if full_content is None:
+            full_content = self.render_article_markdown(article)
 
-        # Save markdown file
+        # Save markdown file, writing to a temp file first so a crash never
+        # leaves a partial article behind
         try:
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write(full_content)
+            write_bytes_atomic(filepath, full_content.encode("utf-8"))
 
             # Update metadata in the central store
             all_metadata[article_id] = {
@@ -235,6 +569,7 @@ class Scraper:
                 "updated_at": article.get("updated_at"),
                 "edited_at": article.get("edited_at"),
                 "markdown_file": filename,
+                "content_sha256": self.article_content_hash(article),
                 "last_scraped": self.get_current_timestamp(),
                 "openai_upload_status": "pending",  # Track upload status
                 "skip_vector_store": False,  # Whether to skip this file from vector store
@@ -243,7 +578,8 @@ class Scraper:
             }
 
             # Save updated metadata
-            self.save_articles_metadata(all_metadata, output_dir)
+            if save_metadata:
+                self.save_articles_metadata(all_metadata, output_dir)
 
             return filepath
         except Exception as e:
@@ -252,20 +588,14 @@ class Scraper:
 
     def get_current_timestamp(self):
         """Get current timestamp in ISO format"""
-        from datetime import datetime
-
         return datetime.now().isoformat()
 
-    def get_articles_from_section(self, section_id):
+    async def get_articles_from_section(self, http_client, section_id):
         """Get all articles from a specific section ID with full content"""
         url = f"{self.base_url}/sections/{section_id}/articles?sort_by=position&sort_order=desc&per_page=100"
 
         try:
-            response = requests.get(url)
-            response.raise_for_status()  # Raise an exception for bad status codes
-
-            data = response.json()
-            articles = data.get("articles", [])
+            articles = await self.fetch_all_pages(http_client, url, "articles")
 
             article_data = []
             for article in articles:
@@ -292,105 +622,175 @@ class Scraper:
 
             return article_data
 
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"Error fetching articles for section {section_id}: {e}")
             return []
         except json.JSONDecodeError as e:
             print(f"Error parsing JSON for section {section_id}: {e}")
             return []
 
-    def get_sections_from_categories_concurrent(self, category_ids):
-        """Get all sections from multiple category IDs concurrently"""
-        all_sections = []
-        results = {}
+    async def get_category_articles(self, http_client, category_id, on_articles=None):
+        """Get a category's sections, then fetch their articles as they arrive"""
+        sections = await self.get_sections_from_category(http_client, category_id)
 
-        print("Fetching sections from all categories concurrently...")
+        async def fetch_section(section):
+            articles = await self.get_articles_from_section(http_client, section["id"])
+            if on_articles is not None:
+                on_articles(articles)
+            return articles
 
-        # Use ThreadPoolExecutor to fetch all categories concurrently
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            # Submit all category requests
-            future_to_category = {
-                executor.submit(
-                    self.get_sections_from_category, category_id
-                ): category_id
-                for category_id in category_ids
-            }
+        results = await asyncio.gather(
+            *(fetch_section(section) for section in sections),
+            return_exceptions=True,
+        )
+        return sections, results
 
-            # Process completed requests as they finish
-            for future in as_completed(future_to_category):
-                category_id = future_to_category[future]
-                try:
-                    sections = future.result()
-                    results[category_id] = sections
-                except Exception as exc:
-                    print(f"✗ Category {category_id}: Error occurred - {exc}")
-                    results[category_id] = []
-
-        # Collect all sections in order of category IDs
-        for category_id in category_ids:
-            if category_id in results:
-                sections = results[category_id]
-                if sections:
-                    all_sections.extend(sections)
-
-        return all_sections
-
-    def get_articles_from_sections_concurrent(self, sections):
-        """Get all articles from multiple section IDs concurrently and save as Markdown"""
+    async def get_articles_from_categories_concurrent(
+        self, http_client, category_ids, on_articles=None
+    ):
+        """Get all sections and articles from multiple category IDs concurrently"""
+        all_sections = []
         all_articles = []
-        results = {}
 
-        print("Fetching articles from all sections concurrently...")
+        print("Fetching sections and articles from all categories concurrently...")
 
-        # Use ThreadPoolExecutor to fetch all sections concurrently
-        with ThreadPoolExecutor(max_workers=15) as executor:
-            # Submit all section requests
-            future_to_section = {
-                executor.submit(self.get_articles_from_section, section["id"]): section
-                for section in sections
-            }
+        # Each category's article requests start as soon as its own sections
+        # arrive rather than after every category has answered, and each
+        # section's articles go to on_articles as they come in; gather keeps
+        # the results in the order of category IDs
+        results = await asyncio.gather(
+            *(
+                self.get_category_articles(http_client, category_id, on_articles)
+                for category_id in category_ids
+            ),
+            return_exceptions=True,
+        )
 
-            # Process completed requests as they finish
-            for future in as_completed(future_to_section):
-                section = future_to_section[future]
-                section_id = section["id"]
-                section_name = section["name"]
-                try:
-                    articles = future.result()
-                    results[section_id] = articles
-                except Exception as exc:
+        for category_id, result in zip(category_ids, results):
+            if isinstance(result, Exception):
+                print(f"✗ Category {category_id}: Error occurred - {result}")
+                continue
+            sections, section_results = result
+            all_sections.extend(sections)
+            for section, articles in zip(sections, section_results):
+                if isinstance(articles, Exception):
                     print(
-                        f"✗ Section {section_name} ({section_id}): Error occurred - {exc}"
+                        f"✗ Section {section['name']} ({section['id']}): Error occurred - {articles}"
                     )
-                    results[section_id] = []
+                    continue
+                all_articles.extend(articles)
 
-        # Collect all articles in order of sections and save as Markdown
+        return all_sections, all_articles
+
+    def start_rendering(self, articles, all_metadata, executor, rendering, pending):
+        """Start rendering changed articles in the process pool"""
+        # HTML to Markdown conversion is CPU-bound, so it runs across processes.
+        # Changed articles wait in pending until there are enough of them to be
+        # worth starting the workers; a smaller batch is rendered inline when
+        # the articles are saved
+        for article in articles:
+            if article["id"] not in rendering and self.article_needs_update(
+                article, all_metadata
+            ):
+                pending[article["id"]] = article
+        if len(rendering) + len(pending) < _INLINE_RENDER_LIMIT:
+            return
+
+        loop = asyncio.get_running_loop()
+        for article_id, article in pending.items():
+            rendering[article_id] = loop.run_in_executor(
+                executor, self.render_article_markdown, article
+            )
+        pending.clear()
+
+    async def save_articles_as_markdown(
+        self, all_articles, all_metadata=None, rendering=None
+    ):
+        """Save fetched articles as Markdown files and update the central metadata"""
         print("Saving articles as Markdown files...")
 
-        saved_count = 0
-        for section in sections:
-            section_id = section["id"]
-            if section_id in results:
-                articles = results[section_id]
-                for article in articles:
-                    filepath = self.save_article_as_markdown(article)
-                    if filepath:
-                        saved_count += 1
-                all_articles.extend(articles)
+        # Load the metadata once and write it back once after all articles
+        # are saved, rather than once per article
+        if all_metadata is None:
+            all_metadata = self.load_articles_metadata(self.output_dir)
+
+        # Changed articles are usually already rendering (see run_async);
+        # otherwise render them all now
+        if rendering is None:
+            rendering = {}
+            with ProcessPoolExecutor(max_workers=self.render_workers) as executor:
+                self.start_rendering(
+                    all_articles, all_metadata, executor, rendering, {}
+                )
+                rendered = await asyncio.gather(*rendering.values())
+        else:
+            rendered = await asyncio.gather(*rendering.values())
+        rendered_by_id = dict(zip(rendering, rendered))
+
+        # Unchanged and inline-rendered articles are saved here. Ones rendered
+        # in the pool are written from worker threads so the file writes
+        # overlap on slow disks
+        filepaths = [
+            self.save_article_as_markdown(article, all_metadata)
+            for article in all_articles
+            if article["id"] not in rendered_by_id
+        ]
+        filepaths += await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    self.save_article_as_markdown,
+                    article,
+                    all_metadata,
+                    full_content=rendered_by_id[article["id"]],
+                )
+                for article in all_articles
+                if article["id"] in rendered_by_id
+            )
+        )
+        saved_count = sum(1 for filepath in filepaths if filepath)
+
+        self.save_articles_metadata(all_metadata, self.output_dir)
 
         print(f"Successfully saved {saved_count} articles as Markdown files")
-        return all_articles
 
     def run(self, category_ids):
         """Run the complete scraping process"""
-        # Get all sections from categories concurrently
-        all_sections = self.get_sections_from_categories_concurrent(category_ids)
+        return asyncio.run(self.run_async(category_ids))
+
+    async def run_async(self, category_ids):
+        """Run the complete scraping process on a single pooled HTTP client"""
+        # HTTP/2 multiplexes the concurrent requests over a few TLS sessions;
+        # one client is shared by every fetch so the handshakes happen once.
+        # The connection pool caps how many requests are in flight; with no
+        # pool timeout, requests beyond the cap wait for a free connection.
+        # Once enough articles have changed they start rendering as soon as
+        # their section arrives, overlapping the conversion with the fetches
+        all_metadata = self.load_articles_metadata(self.output_dir)
+        rendering = {}
+        pending = {}
+        with ProcessPoolExecutor(max_workers=self.render_workers) as executor:
+            async with httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                timeout=httpx.Timeout(30.0, connect=10.0, pool=None),
+            ) as http_client:
+                all_sections, all_articles = (
+                    await self.get_articles_from_categories_concurrent(
+                        http_client,
+                        category_ids,
+                        on_articles=lambda articles: self.start_rendering(
+                            articles, all_metadata, executor, rendering, pending
+                        ),
+                    )
+                )
 
-        print("-" * 50)
-        print(f"Total sections found: {len(all_sections)}")
+            print("-" * 50)
+            print(f"Total sections found: {len(all_sections)}")
 
-        # Get all articles from sections concurrently
-        all_articles = self.get_articles_from_sections_concurrent(all_sections)
+            await self.save_articles_as_markdown(all_articles, all_metadata, rendering)
 
         print("-" * 50)
         print(f"Total articles found: {len(all_articles)}")
@@ -399,37 +799,11 @@ class Scraper:
         section_ids_only = [section["id"] for section in all_sections]
         article_ids_only = [article["id"] for article in all_articles]
 
-        print(f"Section IDs: {section_ids_only}")
-        print(f"Article IDs: {article_ids_only}")
+        logger.debug("Section IDs: %s", section_ids_only)
+        logger.debug("Article IDs: %s", article_ids_only)
 
         return all_sections, all_articles
 
-    def load_articles_metadata(self, articles_directory="articles"):
-        """Load articles metadata from the central JSON file"""
-        metadata_file = os.path.join(articles_directory, "articles_metadata.json")
-
-        if os.path.exists(metadata_file):
-            try:
-                with open(metadata_file, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"Error loading metadata file: {e}")
-                return {}
-        return {}
-
-    def save_articles_metadata(self, metadata_dict, articles_directory="articles"):
-        """Save articles metadata to the central JSON file"""
-        if not os.path.exists(articles_directory):
-            os.makedirs(articles_directory)
-
-        metadata_file = os.path.join(articles_directory, "articles_metadata.json")
-
-        try:
-            with open(metadata_file, "w", encoding="utf-8") as f:
-                json.dump(metadata_dict, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"Error saving metadata file: {e}")
-
     def update_upload_status(
         self,
         article_id,
@@ -441,22 +815,19 @@ class Scraper:
         """Update the upload status of an article in the metadata"""
         metadata = self.load_articles_metadata(articles_directory)
 
-        if str(article_id) in metadata:
-            from datetime import datetime
-
-            metadata[str(article_id)]["openai_upload_status"] = status
-            metadata[str(article_id)][
-                "last_upload_attempt"
-            ] = datetime.now().isoformat()
+        entry = metadata.get(str(article_id))
+        if entry is not None:
+            entry["openai_upload_status"] = status
+            entry["last_upload_attempt"] = datetime.now().isoformat()
 
             if openai_file_id:
-                metadata[str(article_id)]["openai_file_id"] = openai_file_id
+                entry["openai_file_id"] = openai_file_id
 
             if error:
-                metadata[str(article_id)]["upload_error"] = error
-            elif "upload_error" in metadata[str(article_id)]:
+                entry["upload_error"] = error
+            else:
                 # Clear previous errors on successful upload
-                del metadata[str(article_id)]["upload_error"]
+                entry.pop("upload_error", None)
 
             self.save_articles_metadata(metadata, articles_directory)
 
@@ -465,55 +836,39 @@ class Scraper:
     ):
         """Get list of articles that need to be uploaded to OpenAI"""
         metadata = self.load_articles_metadata(articles_directory)
-        articles_to_upload = []
+        md_index = markdown_file_index(articles_directory)
+
+        # Articles marked to be skipped from vector store, or with no file on
+        # disk, are never candidates
+        candidates = {
+            article_id: article_data
+            for article_id, article_data in metadata.items()
+            if not article_data.get("skip_vector_store", False)
+            and f"{article_id}.md" in md_index
+        }
+        reasons = {
+            article_id: get_upload_reason(article_data, force_reupload)
+            for article_id, article_data in candidates.items()
+        }
 
-        for article_id, article_data in metadata.items():
-            # Skip articles marked to be skipped from vector store
-            if article_data.get("skip_vector_store", False):
-                continue
-                
-            upload_status = article_data.get("openai_upload_status", "pending")
-            current_updated_at = article_data.get("updated_at")
-            last_uploaded_version = article_data.get("last_uploaded_updated_at")
-
-            should_upload = False
-            reason = ""
-
-            if force_reupload:
-                should_upload = True
-                reason = "force_reupload"
-            elif upload_status == "pending":
-                should_upload = True
-                reason = "never_uploaded"
-            elif upload_status == "failed":
-                should_upload = True
-                reason = "previous_upload_failed"
-            elif upload_status == "uploaded":
-                # Check if content has been updated since last upload
-                if current_updated_at and last_uploaded_version:
-                    if current_updated_at != last_uploaded_version:
-                        should_upload = True
-                        reason = "content_updated"
-                elif current_updated_at and not last_uploaded_version:
-                    # Old metadata format, assume needs update
-                    should_upload = True
-                    reason = "metadata_migration"
-
-            if should_upload:
-                md_file = os.path.join(articles_directory, f"{article_id}.md")
-                if os.path.exists(md_file):
-                    articles_to_upload.append(
-                        {
-                            "article_id": article_id,
-                            "file_path": md_file,
-                            "title": article_data.get("title", "Unknown"),
-                            "edited_at": article_data.get("edited_at"),
-                            "updated_at": current_updated_at,
-                            "last_uploaded_version": last_uploaded_version,
-                            "current_status": upload_status,
-                            "upload_reason": reason,
-                        }
-                    )
+        articles_to_upload = [
+            {
+                "article_id": article_id,
+                "file_path": md_index[f"{article_id}.md"],
+                "title": candidates[article_id].get("title", "Unknown"),
+                "edited_at": candidates[article_id].get("edited_at"),
+                "updated_at": candidates[article_id].get("updated_at"),
+                "last_uploaded_version": candidates[article_id].get(
+                    "last_uploaded_updated_at"
+                ),
+                "current_status": candidates[article_id].get(
+                    "openai_upload_status", "pending"
+                ),
+                "upload_reason": reason,
+            }
+            for article_id, reason in reasons.items()
+            if reason
+        ]
 
         return articles_to_upload
 
@@ -597,11 +952,10 @@ class Scraper:
         print("-" * 50)
 
         try:
-            with open(md_file, "rb") as f:
-                response = self.client.files.create(
-                    file=f,
-                    purpose=purpose,
-                )
+            response = self.client.files.create(
+                file=(md_file.name, md_file.read_bytes(), "text/markdown"),
+                purpose=purpose,
+            )
 
             # Update metadata with success
             self.update_upload_status(
@@ -708,78 +1062,164 @@ class Scraper:
 class OpenAIUploader:
     """A utility class for uploading markdown files to OpenAI in batches"""
 
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, max_retries=5):
         """Initialize the uploader with OpenAI client"""
-        print(os.getenv("OPENAI_API_KEY"), "OPENAI_API_KEY")
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # The SDK retries timeouts, connection errors, 429s and 5xx with
+        # exponential backoff (honouring Retry-After), so a transient failure
+        # doesn't fail the file and force a re-run of the whole batch
+        self.max_retries = max_retries
+        # The timeout goes on every client, sync and async, since the SDK sends
+        # it with each request and overrides the connection pool's own
+        self.timeout = httpx.Timeout(60.0, connect=10.0)
+        # One HTTP/2 connection pool shared by every upload/attach request
+        self.client = OpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            timeout=self.timeout,
+            max_retries=max_retries,
+            http_client=DefaultHttpxClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            ),
+        )
         self.store = None
+        # Metadata held in memory while a batch upload is running, and whether
+        # it has changes that still need writing
+        self._metadata_cache = None
+        self._metadata_dirty = False
+        # Parsed metadata per file, reused while its mtime and size match
+        self._metadata_reads = {}
+        # Digest of each metadata file's bytes as last read or written, with
+        # the mtime and size it had then, to skip rewriting identical content
+        self._metadata_digests = {}
         print("OpenAI client initialized.")
 
     def load_articles_metadata(self, output_dir="articles"):
         """Load articles metadata from the central JSON file"""
         metadata_file = os.path.join(output_dir, "articles_metadata.json")
 
-        if os.path.exists(metadata_file):
-            try:
-                with open(metadata_file, "r", encoding="utf-8") as f:
-                    metadata = json.load(f)
-                    # Ensure compatibility with new attachment fields
-                    return self.ensure_metadata_compatibility(metadata)
-            except Exception as e:
-                print(f"Error loading metadata file: {e}")
-                return {}
-        return {}
+        try:
+            st = os.stat(metadata_file)
+        except FileNotFoundError:
+            return {}
+
+        # Callers that modify the returned dict save it, which refreshes the
+        # cached entry, so it can be handed out without copying
+        cached = self._metadata_reads.get(metadata_file)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return cached[2]
+
+        try:
+            with open(metadata_file, "rb") as f:
+                data = f.read()
+            metadata = orjson.loads(data)
+            # Ensure compatibility with new attachment fields
+            metadata = self.ensure_metadata_compatibility(metadata)
+        except Exception as e:
+            print(f"Error loading metadata file: {e}")
+            return {}
+        self._metadata_reads[metadata_file] = (st.st_mtime_ns, st.st_size, metadata)
+        self._metadata_digests[metadata_file] = (
+            st.st_mtime_ns,
+            st.st_size,
+            hashlib.blake2b(data, digest_size=16).digest(),
+        )
+        return metadata
 
     def save_articles_metadata(self, metadata_dict, output_dir="articles"):
         """Save articles metadata to the central JSON file"""
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+        os.makedirs(output_dir, exist_ok=True)
 
         metadata_file = os.path.join(output_dir, "articles_metadata.json")
 
         try:
-            with open(metadata_file, "w", encoding="utf-8") as f:
-                json.dump(metadata_dict, f, indent=2, ensure_ascii=False)
+            data = orjson.dumps(metadata_dict, option=orjson.OPT_INDENT_2)
+            digest = hashlib.blake2b(data, digest_size=16).digest()
+
+            # Skip the write and fsync when the file on disk is the one we last
+            # read or wrote and it already holds exactly these bytes
+            try:
+                st = os.stat(metadata_file)
+                unchanged = self._metadata_digests.get(metadata_file) == (
+                    st.st_mtime_ns,
+                    st.st_size,
+                    digest,
+                )
+            except FileNotFoundError:
+                unchanged = False
+
+            if not unchanged:
+                write_bytes_atomic(metadata_file, data)
+                st = os.stat(metadata_file)
+                self._metadata_digests[metadata_file] = (
+                    st.st_mtime_ns,
+                    st.st_size,
+                    digest,
+                )
+            self._metadata_reads[metadata_file] = (
+                st.st_mtime_ns,
+                st.st_size,
+                metadata_dict,
+            )
         except Exception as e:
+            self._metadata_reads.pop(metadata_file, None)
+            self._metadata_digests.pop(metadata_file, None)
             print(f"Error saving metadata file: {e}")
 
     def get_markdown_file_paths(self, directory):
         """Get all markdown file paths from a directory"""
-        md_files = []
-        directory_path = Path(directory)
-
-        if not directory_path.exists():
+        if not os.path.isdir(directory):
             print(f"Directory {directory} does not exist.")
-            return md_files
+            return []
 
         # Collect all .md files
-        for file_path in directory_path.glob("*.md"):
-            md_files.append(str(file_path))
+        md_files = list(markdown_file_index(directory).values())
 
         print(f"Found {len(md_files)} markdown files in {directory}")
         return md_files
 
     def upload_files_batch(
-        self, file_paths, purpose="assistants", articles_directory="articles"
+        self,
+        file_paths,
+        purpose="assistants",
+        articles_directory="articles",
+        max_concurrency=20,
     ):
         """Upload multiple files to OpenAI using the files.create API and update metadata"""
-        uploaded_files = []
-        failed_uploads = []
+        return asyncio.run(
+            self.upload_files_batch_async(
+                file_paths, purpose, articles_directory, max_concurrency
+            )
+        )
 
+    async def upload_files_batch_async(
+        self,
+        file_paths,
+        purpose="assistants",
+        articles_directory="articles",
+        max_concurrency=20,
+    ):
+        """Upload multiple files to OpenAI concurrently and update metadata"""
         print("\nStarting batch upload to OpenAI...")
         print("-" * 50)
 
-        for file_path in file_paths:
-            try:
-                file_name = os.path.basename(file_path)
-                # Extract article ID from filename (assuming format: {article_id}.md)
-                article_id = os.path.splitext(file_name)[0]
+        # At most max_concurrency uploads are in flight at once
+        semaphore = asyncio.Semaphore(max_concurrency)
 
-                print(f"Uploading {file_name}...")
+        async def upload(client, file_path):
+            file_name = os.path.basename(file_path)
+            # Extract article ID from filename (assuming format: {article_id}.md)
+            article_id = os.path.splitext(file_name)[0]
 
-                with open(file_path, "rb") as f:
-                    response = self.client.files.create(
-                        file=f,
+            try:
+                async with semaphore:
+                    logger.debug("Uploading %s...", file_name)
+
+                    # Articles are small; hand the SDK the bytes directly
+                    # instead of a file object it would read and buffer again.
+                    # The read runs in a thread so it overlaps other uploads
+                    data = await asyncio.to_thread(Path(file_path).read_bytes)
+                    response = await client.files.create(
+                        file=(file_name, data, "text/markdown"),
                         purpose=purpose,
                     )
 
@@ -791,23 +1231,18 @@ class OpenAIUploader:
                     articles_directory=articles_directory,
                 )
 
-                uploaded_files.append(
-                    {
-                        "local_path": file_path,
-                        "file_name": file_name,
-                        "article_id": article_id,
-                        "openai_file_id": response.id,
-                        "status": "success",
-                    }
+                logger.debug(
+                    "✓ Successfully uploaded %s - File ID: %s", file_name, response.id
                 )
-
-                print(f"✓ Successfully uploaded {file_name} - File ID: {response.id}")
+                return {
+                    "local_path": file_path,
+                    "file_name": file_name,
+                    "article_id": article_id,
+                    "openai_file_id": response.id,
+                    "status": "success",
+                }
 
             except Exception as e:
-                # Extract article ID for failed uploads too
-                file_name = os.path.basename(file_path)
-                article_id = os.path.splitext(file_name)[0]
-
                 # Update metadata with failed upload
                 self.update_upload_status(
                     article_id,
@@ -816,16 +1251,36 @@ class OpenAIUploader:
                     articles_directory=articles_directory,
                 )
 
-                failed_uploads.append(
-                    {
-                        "local_path": file_path,
-                        "file_name": file_name,
-                        "article_id": article_id,
-                        "error": str(e),
-                        "status": "failed",
-                    }
-                )
                 print(f"✗ Failed to upload {file_name}: {e}")
+                return {
+                    "local_path": file_path,
+                    "file_name": file_name,
+                    "article_id": article_id,
+                    "error": str(e),
+                    "status": "failed",
+                }
+
+        # Status updates only touch the in-memory metadata until the batch is done
+        self._metadata_cache = self.load_articles_metadata(articles_directory)
+        try:
+            # The async client runs on the aiohttp transport, which holds up much
+            # better than the default httpx one under many concurrent requests
+            async with AsyncOpenAI(
+                api_key=os.getenv("OPENAI_API_KEY"),
+                timeout=self.timeout,
+                max_retries=self.max_retries,
+                http_client=DefaultAioHttpClient(),
+            ) as client:
+                results = await asyncio.gather(
+                    *(upload(client, path) for path in file_paths)
+                )
+        finally:
+            self._flush_metadata(articles_directory)
+
+        # gather keeps results in the order of file_paths, whatever order the
+        # uploads finished in
+        uploaded_files = [r for r in results if r["status"] == "success"]
+        failed_uploads = [r for r in results if r["status"] == "failed"]
 
         # Print summary
         print("\n" + "-" * 50)
@@ -846,54 +1301,46 @@ class OpenAIUploader:
             print("No markdown files found to upload.")
             return [], []
 
-        # Load metadata to check upload status
+        # Load metadata to check upload status; the article ID is the
+        # filename without ".md"
         metadata = self.load_articles_metadata(directory)
-        files_to_upload = []
+        article_ids = [os.path.basename(path)[:-3] for path in all_file_paths]
+        reasons = [
+            get_upload_reason(metadata.get(article_id, {}))
+            for article_id in article_ids
+        ]
+
+        # Steady state: nothing changed, so skip the per-file report
+        if not any(reasons):
+            print(
+                f"All {len(all_file_paths)} files are up to date - no uploads needed."
+            )
+            return [], []
 
         print("Checking upload status for all markdown files...")
         print("-" * 50)
 
-        for file_path in all_file_paths:
-            file_name = os.path.basename(file_path)
-            article_id = os.path.splitext(file_name)[0]
-
-            article_data = metadata.get(article_id, {})
-            upload_status = article_data.get("openai_upload_status", "pending")
-            current_updated_at = article_data.get("updated_at")
-            last_uploaded_version = article_data.get("last_uploaded_updated_at")
-
-            should_upload = False
-            reason = ""
-
-            if upload_status == "pending":
-                should_upload = True
-                reason = "never_uploaded"
-            elif upload_status == "failed":
-                should_upload = True
-                reason = "previous_upload_failed"
-            elif upload_status == "uploaded":
-                # Check if content has been updated since last upload
-                if current_updated_at and last_uploaded_version:
-                    if current_updated_at != last_uploaded_version:
-                        should_upload = True
-                        reason = "content_updated"
-                elif current_updated_at and not last_uploaded_version:
-                    # Old metadata format, assume needs update
-                    should_upload = True
-                    reason = "metadata_migration"
-
-            if should_upload:
-                files_to_upload.append(file_path)
-                title = article_data.get("title", "Unknown")
-                print(f"  📤 {article_id}: {title} (reason: {reason})")
-            else:
-                print(
-                    f"  ⏭ {article_id}: Up to date (File ID: {article_data.get('openai_file_id', 'N/A')})"
-                )
-
-        if not files_to_upload:
-            print("\nAll files are up to date - no uploads needed.")
-            return [], []
+        files_to_upload = [
+            file_path
+            for file_path, reason in zip(all_file_paths, reasons)
+            if reason
+        ]
+
+        # The per-file report only matters with --verbose; skip the walk otherwise
+        if logger.isEnabledFor(logging.DEBUG):
+            for article_id, reason in zip(article_ids, reasons):
+                article_data = metadata.get(article_id, {})
+                if reason:
+                    title = article_data.get("title", "Unknown")
+                    logger.debug(
+                        "  📤 %s: %s (reason: %s)", article_id, title, reason
+                    )
+                else:
+                    logger.debug(
+                        "  ⏭ %s: Up to date (File ID: %s)",
+                        article_id,
+                        article_data.get("openai_file_id", "N/A"),
+                    )
 
         print(
             f"\nFound {len(files_to_upload)} files that need uploading out of {len(all_file_paths)} total files."
@@ -932,23 +1379,19 @@ class OpenAIUploader:
     def get_uploaded_files_info(self, articles_directory="articles"):
         """Get information about files that have been uploaded to OpenAI"""
         metadata = self.load_articles_metadata(articles_directory)
-        uploaded_files = []
 
-        for article_id, article_data in metadata.items():
-            if article_data.get(
-                "openai_upload_status"
-            ) == "uploaded" and article_data.get("openai_file_id"):
-                uploaded_files.append(
-                    {
-                        "article_id": article_id,
-                        "title": article_data.get("title", "Unknown"),
-                        "openai_file_id": article_data.get("openai_file_id"),
-                        "upload_date": article_data.get("last_upload_attempt"),
-                        "edited_at": article_data.get("edited_at"),
-                    }
-                )
-
-        return uploaded_files
+        return [
+            {
+                "article_id": article_id,
+                "title": article_data.get("title", "Unknown"),
+                "openai_file_id": article_data["openai_file_id"],
+                "upload_date": article_data.get("last_upload_attempt"),
+                "edited_at": article_data.get("edited_at"),
+            }
+            for article_id, article_data in metadata.items()
+            if article_data.get("openai_upload_status") == "uploaded"
+            and article_data.get("openai_file_id")
+        ]
 
     def update_upload_status(
         self,
@@ -959,45 +1402,43 @@ class OpenAIUploader:
         articles_directory="articles",
     ):
         """Update the upload status of an article in the metadata"""
-        metadata = self.load_articles_metadata(articles_directory)
-
-        if str(article_id) in metadata:
-            from datetime import datetime
+        # During a batch upload the metadata is held in memory and written
+        # once when the batch ends (see _flush_metadata)
+        batching = self._metadata_cache is not None
+        if batching:
+            metadata = self._metadata_cache
+        else:
+            metadata = self.load_articles_metadata(articles_directory)
 
-            metadata[str(article_id)]["openai_upload_status"] = status
-            metadata[str(article_id)][
-                "last_upload_attempt"
-            ] = datetime.now().isoformat()
+        entry = metadata.get(str(article_id))
+        if entry is not None:
+            entry["openai_upload_status"] = status
+            entry["last_upload_attempt"] = datetime.now().isoformat()
 
             if openai_file_id:
-                metadata[str(article_id)]["openai_file_id"] = openai_file_id
+                entry["openai_file_id"] = openai_file_id
                 # Save the current updated_at as the version that was uploaded
-                current_updated_at = metadata[str(article_id)].get("updated_at")
+                current_updated_at = entry.get("updated_at")
                 if current_updated_at:
-                    metadata[str(article_id)][
-                        "last_uploaded_updated_at"
-                    ] = current_updated_at
+                    entry["last_uploaded_updated_at"] = current_updated_at
 
             if error:
-                metadata[str(article_id)]["upload_error"] = error
-            elif "upload_error" in metadata[str(article_id)]:
+                entry["upload_error"] = error
+            else:
                 # Clear previous errors on successful upload
-                del metadata[str(article_id)]["upload_error"]
-
-            self.save_articles_metadata(metadata, articles_directory)
+                entry.pop("upload_error", None)
 
-    def save_articles_metadata(self, metadata_dict, articles_directory="articles"):
-        """Save articles metadata to the central JSON file"""
-        if not os.path.exists(articles_directory):
-            os.makedirs(articles_directory)
-
-        metadata_file = os.path.join(articles_directory, "articles_metadata.json")
+            if batching:
+                self._metadata_dirty = True
+            else:
+                self.save_articles_metadata(metadata, articles_directory)
 
-        try:
-            with open(metadata_file, "w", encoding="utf-8") as f:
-                json.dump(metadata_dict, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"Error saving metadata file: {e}")
+    def _flush_metadata(self, articles_directory="articles"):
+        """Write the in-memory metadata from a batch upload back to disk"""
+        if self._metadata_cache is not None and self._metadata_dirty:
+            self.save_articles_metadata(self._metadata_cache, articles_directory)
+        self._metadata_cache = None
+        self._metadata_dirty = False
 
     def upload_articles_by_ids_batch(
         self,
@@ -1013,6 +1454,7 @@ class OpenAIUploader:
 
         # Get metadata and filter for valid articles
         metadata = self.load_articles_metadata(articles_directory)
+        md_index = markdown_file_index(articles_directory)
         valid_articles = []
         file_paths = []
 
@@ -1022,8 +1464,8 @@ class OpenAIUploader:
                 print(f"⚠ No metadata found for article ID {article_id}")
                 continue
 
-            md_file = os.path.join(articles_directory, f"{article_id}.md")
-            if not os.path.exists(md_file):
+            md_file = md_index.get(f"{article_id}.md")
+            if not md_file:
                 print(f"⚠ File not found: {article_id}.md")
                 continue
 
@@ -1074,7 +1516,27 @@ class OpenAIUploader:
 
         return results
 
-    def create_and_check_vector_store(self):
+    def load_cached_vector_store(
+        self, vector_store_name, articles_directory="articles"
+    ):
+        """Get the vector store saved by a previous run, or None if gone or renamed"""
+        store_id_file = Path(articles_directory) / ".vector_store_id"
+        try:
+            store_id = store_id_file.read_text().strip()
+            store = self.client.vector_stores.retrieve(store_id)
+        except (OSError, ValueError, openai.NotFoundError):
+            # No saved ID, an empty one, or the store was deleted
+            return None
+        return store if store.name == vector_store_name else None
+
+    def save_cached_vector_store(self, store, articles_directory="articles"):
+        """Remember the vector store ID so the next run can retrieve it directly"""
+        try:
+            (Path(articles_directory) / ".vector_store_id").write_text(store.id)
+        except OSError as e:
+            print(f"⚠ Could not save vector store ID: {e}")
+
+    def create_and_check_vector_store(self, articles_directory="articles"):
         """Create and check the vector store for articles"""
         print("Checking if vector store exists...")
         try:
@@ -1083,17 +1545,24 @@ class OpenAIUploader:
                 print("❌ VECTOR_STORE environment variable not set!")
                 return None
 
-            vector_stores = self.client.vector_stores.list()
-            store = None
+            # A single GET for the store found last time instead of listing them all
+            store = self.load_cached_vector_store(vector_store_name, articles_directory)
+            if store is None:
+                # Check if vector store already exists, following pagination
+                # but stopping at the first match
+                store = next(
+                    (
+                        current_store
+                        for current_store in self.client.vector_stores.list(limit=100)
+                        if current_store.name == vector_store_name
+                    ),
+                    None,
+                )
 
-            # Check if vector store already exists
-            for current_store in vector_stores.data:
-                if current_store.name == vector_store_name:
-                    print(
-                        f"✓ Vector store '{vector_store_name}' already exists (ID: {current_store.id})"
-                    )
-                    store = current_store
-                    break
+            if store is not None:
+                print(
+                    f"✓ Vector store '{vector_store_name}' already exists (ID: {store.id})"
+                )
             else:
                 # Create new vector store if it doesn't exist
                 print(f"Creating new vector store: '{vector_store_name}'...")
@@ -1103,6 +1572,7 @@ class OpenAIUploader:
                 print(f"✓ Created new vector store: {store.name} (ID: {store.id})")
 
             self.store = store
+            self.save_cached_vector_store(store, articles_directory)
 
             # Show vector store details
             print(f"Vector Store Details:")
@@ -1124,37 +1594,140 @@ class OpenAIUploader:
             print("No vector store available to attach files.")
             return False
 
-        try:
-            response = self.client.post(
-                f"/vector_stores/{self.store.id}/files",
-                body={"file_id": file_id},
-                cast_to=httpx.Response,
-            )
+        attached = self.attach_files([file_id])[file_id] != "failed"
+        if attached:
             print(f"✓ Successfully attached file {file_id} to vector store")
-            
-            # Update metadata if article_id is provided
-            if article_id:
-                metadata = self.load_articles_metadata(articles_directory)
-                if article_id in metadata:
-                    from datetime import datetime
-                    metadata[article_id]["vector_store_attachment_status"] = "attached"
-                    metadata[article_id]["vector_store_attached_at"] = datetime.now().isoformat()
-                    metadata[article_id]["vector_store_id"] = self.store.id
-                    self.save_articles_metadata(metadata, articles_directory)
-            
-            return True
 
+        # Update metadata if article_id is provided
+        if article_id:
+            metadata = self.load_articles_metadata(articles_directory)
+            entry = metadata.get(article_id)
+            if entry is not None:
+                if attached:
+                    entry["vector_store_attachment_status"] = "attached"
+                    entry["vector_store_attached_at"] = datetime.now().isoformat()
+                    entry["vector_store_id"] = self.store.id
+                else:
+                    entry["vector_store_attachment_status"] = "failed"
+                self.save_articles_metadata(metadata, articles_directory)
+
+        return attached
+
+    def get_vector_store_file_ids(self):
+        """Get the IDs of all files currently attached to the vector store"""
+        try:
+            return {
+                vs_file.id
+                for vs_file in self.client.vector_stores.files.list(
+                    vector_store_id=self.store.id, limit=100
+                )
+            }
         except Exception as e:
-            print(f"✗ Error attaching file {file_id} to vector store: {e}")
-            
-            # Update metadata for failed attachment if article_id is provided
-            if article_id:
-                metadata = self.load_articles_metadata(articles_directory)
-                if article_id in metadata:
-                    metadata[article_id]["vector_store_attachment_status"] = "failed"
-                    self.save_articles_metadata(metadata, articles_directory)
-            
-            return False
+            print(f"⚠ Could not list vector store files: {e}")
+            return set()
+
+    def wait_for_file_batch(self, batch, max_delay=30.0, timeout=600.0):
+        """Poll a vector store file batch until it finishes or timeout seconds pass"""
+        # Backs off exponentially with jitter. A batch still running at the
+        # deadline is cancelled and TimeoutError raised
+        deadline = time.monotonic() + timeout
+        delay = 1.0
+        while batch.status == "in_progress":
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.client.vector_stores.file_batches.cancel(
+                    batch.id, vector_store_id=self.store.id
+                )
+                raise TimeoutError(
+                    f"file batch {batch.id} still in progress after {timeout:.0f}s"
+                )
+            time.sleep(min(delay + random.uniform(0, 0.25 * delay), remaining))
+            delay = min(delay * 1.8, max_delay)
+            batch = self.client.vector_stores.file_batches.retrieve(
+                batch.id, vector_store_id=self.store.id
+            )
+        return batch
+
+    def attach_file_batches(self, file_ids, batch_size=500):
+        """Attach files in file batches and return each file's status"""
+        file_statuses = {}
+        for start in range(0, len(file_ids), batch_size):
+            chunk = file_ids[start : start + batch_size]
+            try:
+                batch = self.wait_for_file_batch(
+                    self.client.vector_stores.file_batches.create(
+                        vector_store_id=self.store.id, file_ids=chunk
+                    )
+                )
+                # Only failed/cancelled files need listing; the rest completed
+                not_attached = set()
+                for status in ("failed", "cancelled"):
+                    if getattr(batch.file_counts, status):
+                        vs_files = self.client.vector_stores.file_batches.list_files(
+                            batch.id,
+                            vector_store_id=self.store.id,
+                            filter=status,
+                            limit=100,
+                        )
+                        not_attached.update(vs_file.id for vs_file in vs_files)
+            except Exception as e:
+                print(f"⚠ File batch attach failed, attaching files one by one: {e}")
+                continue
+
+            completed = batch.file_counts.completed
+            print(f"✓ File batch {batch.id}: {completed}/{len(chunk)} files attached")
+            for file_id in chunk:
+                failed = file_id in not_attached
+                file_statuses[file_id] = "failed" if failed else "completed"
+        return file_statuses
+
+    async def attach_files_async(self, file_ids, max_concurrency=8):
+        """Attach files one request each, concurrently, and return each file's status"""
+        # At most max_concurrency attach requests are in flight at once
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def attach(client, file_id):
+            try:
+                async with semaphore:
+                    await client.vector_stores.files.create(
+                        vector_store_id=self.store.id, file_id=file_id
+                    )
+                return "completed"
+            except openai.APIStatusError as e:
+                # A conflict means the file is already in the store; 5xx and
+                # other client errors are real failures
+                error_str = e.message.lower()
+                if e.status_code == 409 or (
+                    e.status_code == 400
+                    and ("already" in error_str or "duplicate" in error_str)
+                ):
+                    return "already"
+                print(f"✗ Error attaching file {file_id} to vector store: {e}")
+                return "failed"
+            except openai.APIError as e:
+                print(f"✗ Error attaching file {file_id} to vector store: {e}")
+                return "failed"
+
+        async with AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            timeout=self.timeout,
+            max_retries=self.max_retries,
+            http_client=DefaultAioHttpClient(),
+        ) as client:
+            statuses = await asyncio.gather(
+                *(attach(client, file_id) for file_id in file_ids)
+            )
+        return dict(zip(file_ids, statuses))
+
+    def attach_files(self, file_ids):
+        """Attach files in file batches where possible and return each file's status"""
+        file_statuses = self.attach_file_batches(file_ids)
+        # Fall back to one request per file for anything the batch endpoint
+        # couldn't take
+        fallback_ids = [file_id for file_id in file_ids if file_id not in file_statuses]
+        if fallback_ids:
+            file_statuses.update(asyncio.run(self.attach_files_async(fallback_ids)))
+        return file_statuses
 
     def attach_uploaded_files_to_vector_store(self, articles_directory="articles"):
         """Read metadata and attach all uploaded files to the vector store"""
@@ -1225,14 +1798,17 @@ class OpenAIUploader:
         if files_needing_update:
             print(f"Processing {len(files_needing_update)} files that need updates...")
             
+            # New versions are attached together once they're all uploaded
+            reattach_entries = {}
             for file_info in files_needing_update:
                 article_id = file_info["article_id"]
                 old_file_id = file_info["old_file_id"]
                 title = file_info["title"]
+                entry = metadata[article_id]
                 
                 try:
                     # Step 1: Delete old file from vector store if it's attached
-                    if metadata[article_id].get("vector_store_attachment_status") == "attached":
+                    if entry.get("vector_store_attachment_status") == "attached":
                         print(f"Removing old version of '{title}' from vector store...")
                         try:
                             self.client.delete(f"/vector_stores/{self.store.id}/files/{old_file_id}")
@@ -1252,28 +1828,7 @@ class OpenAIUploader:
                     if upload_result and upload_result.get("status") == "success":
                         new_file_id = upload_result["openai_file_id"]
                         print(f"✓ Successfully uploaded new version (File ID: {new_file_id})")
-                        
-                        # Step 3: Attach new file to vector store
-                        try:
-                            response = self.client.post(
-                                f"/vector_stores/{self.store.id}/files",
-                                body={"file_id": new_file_id},
-                                cast_to=httpx.Response,
-                            )
-                            
-                            # Update metadata for successful attachment
-                            from datetime import datetime
-                            metadata[article_id]["vector_store_attachment_status"] = "attached"
-                            metadata[article_id]["vector_store_attached_at"] = datetime.now().isoformat()
-                            metadata[article_id]["vector_store_id"] = self.store.id
-                            
-                            files_updated_count += 1
-                            print(f"✓ Successfully attached updated file to vector store")
-                            
-                        except Exception as attach_error:
-                            print(f"✗ Failed to attach updated file to vector store: {attach_error}")
-                            metadata[article_id]["vector_store_attachment_status"] = "failed"
-                            files_update_failed_count += 1
+                        reattach_entries[new_file_id] = entry
                     else:
                         print(f"✗ Failed to upload updated version of '{title}'")
                         files_update_failed_count += 1
@@ -1282,6 +1837,23 @@ class OpenAIUploader:
                     print(f"✗ Error processing update for '{title}': {e}")
                     files_update_failed_count += 1
 
+            # Step 3: Attach the new files to the vector store
+            if reattach_entries:
+                reattach_statuses = self.attach_files(list(reattach_entries))
+                now_iso = datetime.now().isoformat()
+                for new_file_id, entry in reattach_entries.items():
+                    if reattach_statuses[new_file_id] == "failed":
+                        entry["vector_store_attachment_status"] = "failed"
+                        files_update_failed_count += 1
+                        continue
+                    entry["vector_store_attachment_status"] = "attached"
+                    entry["vector_store_attached_at"] = now_iso
+                    entry["vector_store_id"] = self.store.id
+                    files_updated_count += 1
+                print(
+                    f"✓ Attached {files_updated_count} updated files to vector store"
+                )
+
         if not uploaded_files and not files_needing_update:
             if already_attached_count > 0:
                 print(f"No files to attach. {already_attached_count} files are already attached to the vector store.")
@@ -1297,55 +1869,48 @@ class OpenAIUploader:
             print(f"Skipping {already_attached_count} files that are already attached and up to date.")
 
         added_count = 0
-        updated_count = 0
         skipped_count = 0
         failed_count = 0
-        total_chunks = 0
 
+        # Files the store already holds are marked attached without a POST
+        attached_ids = self.get_vector_store_file_ids() if uploaded_files else set()
+        file_statuses = {
+            file_info["file_id"]: "already"
+            for file_info in uploaded_files
+            if file_info["file_id"] in attached_ids
+        }
+
+        # Attach the rest with file batches
+        pending_ids = [
+            file_info["file_id"]
+            for file_info in uploaded_files
+            if file_info["file_id"] not in file_statuses
+        ]
+        file_statuses.update(self.attach_files(pending_ids))
+
+        now_iso = datetime.now().isoformat()
         for file_info in uploaded_files:
-            try:
-                response = self.client.post(
-                    f"/vector_stores/{self.store.id}/files",
-                    body={"file_id": file_info["file_id"]},
-                    cast_to=httpx.Response,
-                )
+            status = file_statuses[file_info["file_id"]]
+            entry = metadata.get(file_info["article_id"])
+            if status == "failed":
+                failed_count += 1
+                # Update metadata for failed attachments
+                if entry is not None:
+                    entry["vector_store_attachment_status"] = "failed"
+                continue
 
-                # Update metadata for successful attachment
-                article_id = file_info["article_id"]
-                if article_id in metadata:
-                    from datetime import datetime
-                    metadata[article_id]["vector_store_attachment_status"] = "attached"
-                    metadata[article_id]["vector_store_attached_at"] = datetime.now().isoformat()
-                    metadata[article_id]["vector_store_id"] = self.store.id
-
-                if hasattr(response, "status") and response.status == "completed":
-                    added_count += 1
-                    if hasattr(response, "chunking_strategy"):
-                        # Estimate chunks based on file size or tokens
-                        total_chunks += getattr(response, "chunk_count", 1)
-                elif hasattr(response, "status") and response.status == "in_progress":
-                    updated_count += 1
-                else:
-                    added_count += 1
+            if status == "already":
+                skipped_count += 1
+            else:
+                added_count += 1
 
-            except Exception as e:
-                error_str = str(e).lower()
-                if "already" in error_str or "duplicate" in error_str:
-                    skipped_count += 1
-                    # Update metadata for already attached files
-                    article_id = file_info["article_id"]
-                    if article_id in metadata:
-                        from datetime import datetime
-                        metadata[article_id]["vector_store_attachment_status"] = "attached"
-                        if not metadata[article_id].get("vector_store_attached_at"):
-                            metadata[article_id]["vector_store_attached_at"] = datetime.now().isoformat()
-                        metadata[article_id]["vector_store_id"] = self.store.id
-                else:
-                    failed_count += 1
-                    # Update metadata for failed attachments
-                    article_id = file_info["article_id"]
-                    if article_id in metadata:
-                        metadata[article_id]["vector_store_attachment_status"] = "failed"
+            # Update metadata for attached files, keeping the original
+            # timestamp of files that were already attached
+            if entry is not None:
+                entry["vector_store_attachment_status"] = "attached"
+                if status != "already" or not entry.get("vector_store_attached_at"):
+                    entry["vector_store_attached_at"] = now_iso
+                entry["vector_store_id"] = self.store.id
 
         # Save updated metadata
         self.save_articles_metadata(metadata, articles_directory)
@@ -1363,7 +1928,6 @@ class OpenAIUploader:
         if files_update_failed_count > 0:
             print(f"File updates failed: {files_update_failed_count}")
         print(f"Files added: {added_count}")
-        print(f"Files updated: {updated_count}")
         print(f"Files skipped: {skipped_count}")
         print(f"Files failed: {failed_count}")
         # Get updated vector store info
@@ -1384,10 +1948,12 @@ class OpenAIUploader:
             "files_updated": files_updated_count,
             "files_update_failed": files_update_failed_count,
             "added": added_count,
-            "updated": updated_count,
+            # Kept for callers of the old result format; file batches never
+            # report files as updated, and attaching isn't counted in chunks
+            "updated": 0,
             "skipped": skipped_count,
             "failed": failed_count,
-            "chunks": total_chunks,
+            "chunks": 0,
         }
 
     def ensure_metadata_compatibility(self, metadata):
@@ -1501,7 +2067,7 @@ def main():
     ]
 
     # Create scraper instance and run
-    scraper = Scraper()
+    scraper = Scraper(max_connections=positive_int_env("SCRAPER_MAX_CONNECTIONS", 64))
     scraper.run(CATEGORY_IDS)
 
     # upload_single_article()
@@ -1515,5 +2081,13 @@ def main():
 
 
 if __name__ == "__main__":
+    # Log to stdout so the lines interleave with the progress prints in scraper.log.
+    # Only this module's logger gets a handler; the root logger stays at
+    # WARNING so httpx doesn't log a line for every request
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG if "--verbose" in sys.argv[1:] else logging.INFO)
     load_dotenv()  # Load environment variables from .env file if needed
     main()
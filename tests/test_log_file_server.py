@@ -0,0 +1,130 @@
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+import log_file_server
+
+
+@pytest.fixture
+def logs(tmp_path, monkeypatch):
+    logs_dir = tmp_path / "logs"
+    logs_dir.mkdir()
+    logs_dir_str = str(logs_dir.resolve())
+    monkeypatch.setattr(log_file_server, "_LOGS_DIR_STR", logs_dir_str)
+    monkeypatch.setattr(log_file_server.log_files, "directory", logs_dir_str)
+    monkeypatch.setattr(log_file_server.log_files, "all_directories", [logs_dir_str])
+    return logs_dir
+
+
+def test_serves_log_file(logs):
+    (logs / "scraper.log").write_text("hello\n")
+    response = TestClient(log_file_server.app).get("/logs/scraper.log")
+    assert response.status_code == 200
+    assert response.text == "hello\n"
+
+
+def test_symlink_inside_logs_is_served(logs):
+    (logs / "scraper.log").write_text("hello\n")
+    os.symlink(logs / "scraper.log", logs / "latest.log")
+    response = TestClient(log_file_server.app).get("/logs/latest.log")
+    assert response.status_code == 200
+    assert response.text == "hello\n"
+
+
+def test_symlink_escaping_logs_is_not_served(logs, tmp_path):
+    secret = tmp_path / "passwd"
+    secret.write_text("root:x:0:0\n")
+    os.symlink(secret, logs / "passwd_link")
+    client = TestClient(log_file_server.app)
+    assert client.get("/logs/passwd_link").status_code == 404
+    assert (
+        client.get("/logs/passwd_link", headers={"range": "bytes=0-3"}).status_code
+        == 404
+    )
+
+
+def test_range_request_returns_partial_content(logs):
+    (logs / "scraper.log").write_text("0123456789")
+    client = TestClient(log_file_server.app)
+    response = client.get("/logs/scraper.log", headers={"range": "bytes=2-4"})
+    assert response.status_code == 206
+    assert response.text == "234"
+    assert response.headers["content-range"] == "bytes 2-4/10"
+
+    response = client.get("/logs/scraper.log", headers={"range": "bytes=-3"})
+    assert response.status_code == 206
+    assert response.text == "789"
+
+    response = client.get("/logs/scraper.log", headers={"range": "bytes=10-"})
+    assert response.status_code == 416
+
+
+def test_if_range_uses_the_served_etag(logs):
+    (logs / "scraper.log").write_text("0123456789")
+    client = TestClient(log_file_server.app)
+    etag = client.get("/logs/scraper.log").headers["etag"]
+
+    response = client.get(
+        "/logs/scraper.log", headers={"range": "bytes=5-", "if-range": etag}
+    )
+    assert response.status_code == 206
+    assert response.text == "56789"
+
+    response = client.get(
+        "/logs/scraper.log", headers={"range": "bytes=5-", "if-range": '"stale"'}
+    )
+    assert response.status_code == 200
+    assert response.text == "0123456789"
+
+
+def test_unchanged_log_file_is_not_modified(logs):
+    (logs / "scraper.log").write_text("hello\n")
+    client = TestClient(log_file_server.app)
+    response = client.get("/logs/scraper.log")
+    etag = response.headers["etag"]
+    last_modified = response.headers["last-modified"]
+
+    response = client.get("/logs/scraper.log", headers={"if-none-match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    response = client.get(
+        "/logs/scraper.log", headers={"if-modified-since": last_modified}
+    )
+    assert response.status_code == 304
+
+
+def test_changed_log_file_is_sent_again(logs):
+    log = logs / "scraper.log"
+    log.write_text("hello\n")
+    client = TestClient(log_file_server.app)
+    etag = client.get("/logs/scraper.log").headers["etag"]
+
+    log.write_text("hello\nworld\n")
+    os.utime(log, (1, 1))
+    response = client.get("/logs/scraper.log", headers={"if-none-match": etag})
+    assert response.status_code == 200
+    assert response.text == "hello\nworld\n"
+    assert response.headers["etag"] != etag
+
+
+def test_watched_listing_still_expires(logs, monkeypatch):
+    (logs / "scraper.log").write_text("hello\n")
+    monkeypatch.setitem(log_file_server._listing_cache, "watched", True)
+    monkeypatch.setitem(log_file_server._listing_cache, "ts", 0.0)
+    client = TestClient(log_file_server.app)
+    assert client.get("/").json()["available_files"] == ["scraper.log"]
+
+    # A file the watcher never reported shows up once the long TTL has passed
+    (logs / "scraper.log.swp").write_text("")
+    assert client.get("/").json()["available_files"] == ["scraper.log"]
+    monkeypatch.setitem(
+        log_file_server._listing_cache,
+        "ts",
+        log_file_server._listing_cache["ts"] - log_file_server._WATCHED_LISTING_TTL,
+    )
+    assert sorted(client.get("/").json()["available_files"]) == [
+        "scraper.log",
+        "scraper.log.swp",
+    ]
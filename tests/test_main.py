@@ -0,0 +1,221 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+import main
+
+
+def _article(**overrides):
+    article = {
+        "id": 1,
+        "title": "Title",
+        "section_id": 10,
+        "html_url": "https://example.com/1",
+        "body": "<p>Body</p>",
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-02T00:00:00Z",
+        "edited_at": "2024-01-02T00:00:00Z",
+    }
+    article.update(overrides)
+    return article
+
+
+def test_content_neutral_edit_does_not_trigger_reupload(tmp_path):
+    scraper = main.Scraper(output_dir=str(tmp_path))
+    metadata = {}
+    scraper.save_article_as_markdown(_article(), metadata)
+
+    entry = metadata["1"]
+    entry["openai_upload_status"] = "uploaded"
+    entry["last_uploaded_updated_at"] = entry["updated_at"]
+    assert main.get_upload_reason(entry) is None
+
+    scraper.save_article_as_markdown(
+        _article(updated_at="2024-02-01T00:00:00Z", edited_at="2024-02-01T00:00:00Z"),
+        metadata,
+    )
+    assert entry["updated_at"] == "2024-02-01T00:00:00Z"
+    assert main.get_upload_reason(entry) is None
+    # The file doesn't carry the update times, so it still matches the metadata
+    assert (tmp_path / "1.md").read_text() == scraper.render_article_markdown(
+        _article(updated_at="2024-02-01T00:00:00Z", edited_at="2024-02-01T00:00:00Z")
+    )
+
+
+def test_content_change_still_triggers_reupload(tmp_path):
+    scraper = main.Scraper(output_dir=str(tmp_path))
+    metadata = {}
+    scraper.save_article_as_markdown(_article(), metadata)
+    metadata["1"]["openai_upload_status"] = "uploaded"
+    metadata["1"]["last_uploaded_updated_at"] = metadata["1"]["updated_at"]
+
+    scraper.save_article_as_markdown(
+        _article(body="<p>New body</p>", edited_at="2024-02-01T00:00:00Z"),
+        metadata,
+    )
+    assert main.get_upload_reason(metadata["1"]) == "never_uploaded"
+
+
+def test_save_creates_a_custom_output_dir(tmp_path):
+    scraper = main.Scraper(output_dir=str(tmp_path / "articles"))
+    output_dir = tmp_path / "elsewhere"
+    filepath = scraper.save_article_as_markdown(_article(), output_dir=str(output_dir))
+    assert filepath == str(output_dir / "1.md")
+    assert (output_dir / "1.md").exists()
+
+
+def _mock_client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_fetch_json_serves_fresh_entries_from_the_disk_cache(tmp_path):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"n": len(requests)})
+
+    url = "https://example.com/api?per_page=100"
+
+    async def fetch(scraper):
+        async with _mock_client(handler) as client:
+            return await scraper.fetch_json(client, url)
+
+    assert asyncio.run(fetch(main.Scraper(output_dir=str(tmp_path)))) == {"n": 1}
+    # A new scraper has an empty memory cache but finds the entry on disk
+    assert asyncio.run(fetch(main.Scraper(output_dir=str(tmp_path)))) == {"n": 1}
+    assert len(requests) == 1
+
+
+def test_fetch_json_revalidates_stale_entries_with_their_etag(tmp_path):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"etag": '"v1"'})
+        return httpx.Response(200, json={"items": [1]}, headers={"etag": '"v1"'})
+
+    scraper = main.Scraper(output_dir=str(tmp_path), cache_ttl=0)
+    url = "https://example.com/api?per_page=100"
+
+    async def fetch_twice():
+        async with _mock_client(handler) as client:
+            return [await scraper.fetch_json(client, url) for _ in range(2)]
+
+    assert asyncio.run(fetch_twice()) == [{"items": [1]}, {"items": [1]}]
+    assert "if-none-match" not in requests[0].headers
+    assert requests[1].headers["if-none-match"] == '"v1"'
+
+
+def test_fetch_json_shares_one_request_between_concurrent_callers(tmp_path):
+    requests = []
+
+    async def handler(request):
+        requests.append(request)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"ok": True})
+
+    scraper = main.Scraper(output_dir=str(tmp_path))
+    url = "https://example.com/api?per_page=100"
+
+    async def fetch_concurrently():
+        async with _mock_client(handler) as client:
+            return await asyncio.gather(
+                *(scraper.fetch_json(client, url) for _ in range(5))
+            )
+
+    assert asyncio.run(fetch_concurrently()) == [{"ok": True}] * 5
+    assert len(requests) == 1
+
+
+def test_fetch_all_pages_fetches_every_page(tmp_path):
+    def handler(request):
+        page = int(request.url.params.get("page", "1"))
+        return httpx.Response(200, json={"items": [page], "page_count": 3})
+
+    scraper = main.Scraper(output_dir=str(tmp_path))
+
+    async def fetch():
+        async with _mock_client(handler) as client:
+            return await scraper.fetch_all_pages(
+                client, "https://example.com/api?per_page=1", "items"
+            )
+
+    assert asyncio.run(fetch()) == [1, 2, 3]
+
+
+@pytest.fixture
+def uploader(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    return main.OpenAIUploader()
+
+
+def test_stuck_file_batch_is_cancelled_and_attached_file_by_file(uploader, monkeypatch):
+    cancelled = []
+    fallback = []
+
+    class FileBatches:
+        def create(self, vector_store_id, file_ids):
+            return SimpleNamespace(id="batch-1", status="in_progress")
+
+        def retrieve(self, batch_id, vector_store_id):
+            return SimpleNamespace(id=batch_id, status="in_progress")
+
+        def cancel(self, batch_id, vector_store_id):
+            cancelled.append(batch_id)
+
+    async def attach_files_async(file_ids):
+        fallback.extend(file_ids)
+        return {file_id: "completed" for file_id in file_ids}
+
+    # Sleeping advances a fake clock, so the deadline passes immediately
+    clock = [0.0]
+    monkeypatch.setattr(main.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(
+        main.time, "sleep", lambda seconds: clock.__setitem__(0, clock[0] + seconds)
+    )
+    uploader.client = SimpleNamespace(
+        vector_stores=SimpleNamespace(file_batches=FileBatches())
+    )
+    uploader.store = SimpleNamespace(id="vs-1")
+    monkeypatch.setattr(uploader, "attach_files_async", attach_files_async)
+
+    statuses = uploader.attach_files(["file-1", "file-2"])
+
+    assert cancelled == ["batch-1"]
+    assert fallback == ["file-1", "file-2"]
+    assert statuses == {"file-1": "completed", "file-2": "completed"}
+
+
+def test_unchanged_metadata_is_not_rewritten(uploader, tmp_path, monkeypatch):
+    writes = []
+    write_bytes_atomic = main.write_bytes_atomic
+
+    def counting_write(path, data):
+        writes.append(path)
+        write_bytes_atomic(path, data)
+
+    monkeypatch.setattr(main, "write_bytes_atomic", counting_write)
+    output_dir = str(tmp_path)
+
+    uploader.save_articles_metadata({"1": {"title": "A"}}, output_dir)
+    uploader.save_articles_metadata({"1": {"title": "A"}}, output_dir)
+    assert len(writes) == 1
+
+    uploader.save_articles_metadata({"1": {"title": "B"}}, output_dir)
+    assert len(writes) == 2
+    assert uploader.load_articles_metadata(output_dir) == {"1": {"title": "B"}}
+
+
+def test_failed_article_write_leaves_no_temp_file(tmp_path, monkeypatch):
+    scraper = main.Scraper(output_dir=str(tmp_path))
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(main.os, "replace", fail)
+    assert scraper.save_article_as_markdown(_article(), {}) is None
+    assert sorted(p.name for p in tmp_path.iterdir()) == [".http_cache"]